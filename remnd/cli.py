@@ -1,33 +1,47 @@
 from __future__ import annotations
 import argparse
 import datetime as dt
+import functools
 import re
 import os
-import shutil
-from pathlib import Path
-import subprocess
-import textwrap
+import sys
+import time
+from typing import TYPE_CHECKING
 
 from .storage import (
     add_reminder, delete_reminder, list_reminders, mark_complete,
-    due_unnotified, mark_notified, due_active, due_renotify, 
+    due_unnotified, mark_notified_many, due_active, due_renotify, 
     get_reminder
 )
 
+if TYPE_CHECKING:
+    import subprocess
+
+
+# Unit files and the executable path are resolved on demand (install/uninstall
+# only) so that the per-minute `notify-due` run never pays for them.
+def _systemd_dir() -> str:
+    return os.path.join(os.path.expanduser("~"), ".config", "systemd", "user")
+
+
+def _remnd_exec() -> str:
+    import shutil
+    return shutil.which("remnd") or "%h/.local/bin/remnd"
+
 
-SYSTEMD_DIR = Path.home() / ".config" / "systemd" / "user"
 NOTIFY_SERVICE = "remnd-notify.service"
 NOTIFY_TIMER = "remnd-notify.timer"
 
 
-NOTIFY_SERVICE_UNIT = textwrap.dedent(f"""\
+def _notify_service_unit(exe: str) -> str:
+    return f"""\
 [Unit]
 Description=Send notifications for due remnd reminders
 
 [Service]
 Type=oneshot
-ExecStart={shutil.which("remnd") or "%h/.local/bin/remnd"} notify-due
-""")
+ExecStart={exe} notify-due
+"""
 
 
 NOTIFY_TIMER_UNIT = """\
@@ -48,7 +62,8 @@ CATCHUP_SERVICE = "remnd-catchup.service"
 CATCHUP_TIMER = "remnd-catchup.timer"
 
 
-CATCHUP_SERVICE_UNIT = textwrap.dedent(f"""\
+def _catchup_service_unit(exe: str) -> str:
+    return f"""\
 [Unit]
 Description=Re-notify all due, uncompleted remnd reminders at login
 After=graphical-session.target
@@ -56,8 +71,8 @@ Wants=graphical-session.target
 
 [Service]
 Type=oneshot
-ExecStart={shutil.which("remnd") or "%h/.local/bin/remnd"} notify-catchup
-""")
+ExecStart={exe} notify-catchup
+"""
 
 
 CATCHUP_TIMER_UNIT = """\
@@ -79,14 +94,15 @@ RENOTIFY_SERVICE = "remnd-renotify.service"
 RENOTIFY_TIMER = "remnd-renotify.timer"
 
 
-RENOTIFY_SERVICE_UNIT = textwrap.dedent(f"""\
+def _renotify_service_unit(exe: str) -> str:
+    return f"""\
 [Unit]
 Description=Re-notify overdue remnd reminders
 
 [Service]
 Type=oneshot
-ExecStart={shutil.which("remnd") or "%h/.local/bin/remnd"} notify-renotify
-""")
+ExecStart={exe} notify-renotify
+"""
 
 
 RENOTIFY_TIMER_UNIT = """\
@@ -103,18 +119,33 @@ WantedBy=default.target
 """
 
 
+_UNIT_NAMES = (NOTIFY_SERVICE, NOTIFY_TIMER, CATCHUP_SERVICE, CATCHUP_TIMER, RENOTIFY_SERVICE, RENOTIFY_TIMER)
+
+
+def _unit_files() -> list[tuple[str, str]]:
+    """(file name, contents) for every unit we install, in _UNIT_NAMES order."""
+    exe = _remnd_exec()
+    return [
+        (NOTIFY_SERVICE, _notify_service_unit(exe)),
+        (NOTIFY_TIMER, NOTIFY_TIMER_UNIT),
+        (CATCHUP_SERVICE, _catchup_service_unit(exe)),
+        (CATCHUP_TIMER, CATCHUP_TIMER_UNIT),
+        (RENOTIFY_SERVICE, _renotify_service_unit(exe)),
+        (RENOTIFY_TIMER, RENOTIFY_TIMER_UNIT),
+    ]
+
+
 def _systemctl_user(*args: str) -> subprocess.CompletedProcess:
+    import subprocess
     return subprocess.run(["systemctl", "--user", *args], check=False, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
 
 
 def cmd_install() -> int:
-    SYSTEMD_DIR.mkdir(parents=True, exist_ok=True)
-    (SYSTEMD_DIR / NOTIFY_SERVICE).write_text(NOTIFY_SERVICE_UNIT)
-    (SYSTEMD_DIR / NOTIFY_TIMER).write_text(NOTIFY_TIMER_UNIT)
-    (SYSTEMD_DIR / CATCHUP_SERVICE).write_text(CATCHUP_SERVICE_UNIT)
-    (SYSTEMD_DIR / CATCHUP_TIMER).write_text(CATCHUP_TIMER_UNIT)
-    (SYSTEMD_DIR / RENOTIFY_SERVICE).write_text(RENOTIFY_SERVICE_UNIT)
-    (SYSTEMD_DIR / RENOTIFY_TIMER).write_text(RENOTIFY_TIMER_UNIT)
+    systemd_dir = _systemd_dir()
+    os.makedirs(systemd_dir, exist_ok=True)
+    for name, body in _unit_files():
+        with open(os.path.join(systemd_dir, name), "w") as f:
+            f.write(body)
     _systemctl_user("daemon-reload")
     _systemctl_user("enable", "--now", NOTIFY_TIMER)
     _systemctl_user("enable", "--now", CATCHUP_TIMER)
@@ -124,23 +155,24 @@ def cmd_install() -> int:
 
 
 def cmd_uninstall() -> int:
+    systemd_dir = _systemd_dir()
     _systemctl_user("disable", "--now", NOTIFY_TIMER)
     _systemctl_user("disable", "--now", CATCHUP_TIMER)
     _systemctl_user("disable", "--now", RENOTIFY_TIMER)
-    try:
-        (SYSTEMD_DIR / NOTIFY_SERVICE).unlink(missing_ok=True)
-        (SYSTEMD_DIR / NOTIFY_TIMER).unlink(missing_ok=True)
-        (SYSTEMD_DIR / CATCHUP_SERVICE).unlink(missing_ok=True)
-        (SYSTEMD_DIR / CATCHUP_TIMER).unlink(missing_ok=True)
-        (SYSTEMD_DIR / RENOTIFY_SERVICE).unlink(missing_ok=True)
-        (SYSTEMD_DIR / RENOTIFY_TIMER).unlink(missing_ok=True)
-    except Exception:
-        pass
+    for name in _UNIT_NAMES:
+        try:
+            os.remove(os.path.join(systemd_dir, name))
+        except OSError:
+            pass
     _systemctl_user("daemon-reload")
     print(u'\u2705' + " Uninstalled notifier, renotifier, and login catch-up.")
     return 0
 
 
+# Units accepted by _parse_duration, in the order they must appear.
+_DURATION_UNITS = "wdhms"
+
+
 def _parse_duration(spec: str) -> dt.timedelta:
     """
     Accepts: 10m, 1h30m, 45s, 2d4h, 2w, or just an integer (minutes).
@@ -149,12 +181,26 @@ def _parse_duration(spec: str) -> dt.timedelta:
     spec = spec.strip().lower()
     if not spec:
         raise ValueError("Empty duration.")
-    if spec.isdigit():
-        return dt.timedelta(minutes=int(spec))
-    m = re.fullmatch(r"(?:(\d+)w)?(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?", spec)
-    if not m:
-        raise ValueError('Invalid duration. Try "10m", "1h30m", "2w", "45s", or a number (minutes).')
-    w, d, h, mnt, s = (int(x) if x else 0 for x in m.groups())
+
+    # Single pass over <digits><unit> pairs; each unit at most once, in w/d/h/m/s order.
+    # A bare number (digits running to the end on the first pair) means minutes.
+    amounts = [0, 0, 0, 0, 0]
+    last = -1
+    i, n = 0, len(spec)
+    while i < n:
+        j = i
+        while j < n and spec[j].isdecimal():
+            j += 1
+        if j == n and i == 0:
+            return dt.timedelta(minutes=int(spec))
+        k = _DURATION_UNITS.find(spec[j]) if i < j < n else -1
+        if k <= last:
+            raise ValueError('Invalid duration. Try "10m", "1h30m", "2w", "45s", or a number (minutes).')
+        amounts[k] = int(spec[i:j])
+        last = k
+        i = j + 1
+
+    w, d, h, mnt, s = amounts
     td = dt.timedelta(weeks=w, days=d, hours=h, minutes=mnt, seconds=s)
     if td.total_seconds() <= 0:
         raise ValueError("Duration must be positive.")
@@ -172,9 +218,7 @@ _REPEAT_UNIT_MAP = {
 
 
 def _to_epoch_utc(local_dt: dt.datetime) -> int:
-    # Treat naive as local time; convert to timestamp.
-    if local_dt.tzinfo is None:
-        local_dt = local_dt.astimezone()
+    # Naive datetimes are already treated as local time by .timestamp().
     return int(local_dt.timestamp())
 
 
@@ -184,11 +228,17 @@ def _parse_repeat_every(spec: str) -> tuple[int, str]:
     Returns (every:int, unit:str in {'seconds','minutes','hours','days','weeks','months'})
     """
     s = spec.strip().lower()
-    m = re.fullmatch(r"(\d+)\s*([a-z]+)", s)
-    if not m:
+    # <digits>[whitespace]<ascii letters>
+    i = 0
+    while i < len(s) and s[i].isdecimal():
+        i += 1
+    j = i
+    while j < len(s) and s[j].isspace():
+        j += 1
+    unit_key = s[j:]
+    if not i or not (unit_key.isascii() and unit_key.isalpha()):
         raise ValueError('Invalid --every value. Try "15m", "2h", "3d", "2w", "1mo".')
-    n = int(m.group(1))
-    unit_key = m.group(2)
+    n = int(s[:i])
     unit = _REPEAT_UNIT_MAP.get(unit_key)
     if not unit:
         raise ValueError('Unknown repeat unit. Use s, m, h, d, w, or mo.')
@@ -262,37 +312,86 @@ def _parse_due_at(spec: str) -> dt.datetime:
     raise ValueError('Invalid date/time. Try "25-12-2025 14:30", "25-12-25 14:30", "25-12 14:30", "today 18:00", or "21:00".')
 
 
-def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(prog="remnd", description="Simple reminder list (in, at, list, comp, del).")
-    sub = p.add_subparsers(dest="cmd", required=True)
-
+def _build_notify_due(sub) -> None:
     sub.add_parser("notify-due", help="Send desktop notifications for due reminders.")
+
+
+def _build_notify_catchup(sub) -> None:
     sub.add_parser("notify-catchup", help="Re-notify all due, uncompleted reminders (once per login).")
+
+
+def _build_notify_renotify(sub) -> None:
     sub.add_parser("notify-renotify", help="Re-notify all overdue, uncompleted reminders (once per hour).")
+
+
+def _build_install(sub) -> None:
     sub.add_parser("install", help="Install and start the systemd user timer and login catch-up.")
+
+
+def _build_uninstall(sub) -> None:
     sub.add_parser("uninstall", help="Disable and remove the systemd user timer and login catch-up.")
 
+
+def _build_in(sub) -> None:
     p_add = sub.add_parser("in", help="Add a reminder in <duration> from now (e.g. 10m, 1h30m, 2d).")
     p_add.add_argument("when", help="Duration.")
     p_add.add_argument("title", help="Reminder title.")
     p_add.add_argument("--note", "-n", help='Optional note (default "-").')
     p_add.add_argument("--every", "-e", help='Optional repeat interval like "2h", "3d", "1w", "1mo".')
 
+
+def _build_at(sub) -> None:
     p_add_at = sub.add_parser("at", help="Add a reminder at <datetime> (DD-MM[-YY|-YYYY] [HH:MM[:SS]]).")
     p_add_at.add_argument("when", help="Datetime.")
     p_add_at.add_argument("title", help="Reminder title.")
     p_add_at.add_argument("--note", "-n", help='Optional note (default "-").')
     p_add_at.add_argument("--every", "-e", help='Optional repeat interval like "2h", "3d", "1w", "1mo".')
 
+
+def _build_list(sub) -> None:
     p_list = sub.add_parser("list", help="List reminders")
     p_list.add_argument("--all", action="store_true", help="Include completed reminders.")
 
+
+def _build_comp(sub) -> None:
     p_comp = sub.add_parser("comp", help="Mark a reminder as completed by ID.")
     p_comp.add_argument("id", type=int)
 
+
+def _build_del(sub) -> None:
     p_del = sub.add_parser("del", help="Delete a reminder by ID.")
     p_del.add_argument("id", type=int)
 
+
+# Subcommand name -> subparser builder, in the order shown by --help.
+_SUBPARSER_BUILDERS = {
+    "notify-due": _build_notify_due,
+    "notify-catchup": _build_notify_catchup,
+    "notify-renotify": _build_notify_renotify,
+    "install": _build_install,
+    "uninstall": _build_uninstall,
+    "in": _build_in,
+    "at": _build_at,
+    "list": _build_list,
+    "comp": _build_comp,
+    "del": _build_del,
+}
+
+
+def build_parser(cmd: str | None = None) -> argparse.ArgumentParser:
+    """
+    Build the CLI parser. If `cmd` names a known subcommand, only that
+    subparser is constructed; otherwise (help, typos, no args) all are.
+    """
+    p = argparse.ArgumentParser(prog="remnd", description="Simple reminder list (in, at, list, comp, del).")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    if cmd in _SUBPARSER_BUILDERS:
+        _SUBPARSER_BUILDERS[cmd](sub)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(sub)
+
     return p
 
 
@@ -323,15 +422,15 @@ def cmd_add(args) -> int:
 
 def cmd_comp(args) -> int:
     before = get_reminder(args.id)
-    if not before or before["completed_at"] is not None:
+    if not before or before.completed_at is not None:
         print(f"No active reminder #{args.id} (maybe already done or wrong id)")
         return 1
 
-    rolled = (before["repeat_every"] is not None and before["repeat_unit"] is not None)
+    rolled = (before.repeat_every is not None and before.repeat_unit is not None)
     ok = mark_complete(args.id)
     if ok and rolled:
         after = get_reminder(args.id)
-        next_local = dt.datetime.fromtimestamp(int(after["due_at"])).strftime("%d-%m-%Y %H:%M:%S")
+        next_local = dt.datetime.fromtimestamp(int(after.due_at)).strftime("%d-%m-%Y %H:%M:%S")
         print(f"Completed occurrence of #{args.id}; next due @ {next_local}")
         return 0
     if ok:
@@ -347,14 +446,17 @@ def cmd_list(args) -> int:
         print("No reminders.")
         return 0
 
-    print(f"{'ID':>4}  {'Due (local)':<19}  {'Title':<20}  {'Done':<5}  {'Note'}")
+    import shutil
     line_width = min(shutil.get_terminal_size(fallback=(80, 20)).columns, 80)
-    print("-" * line_width)
+    # Build the whole table and write it once rather than print() per row.
+    lines = [f"{'ID':>4}  {'Due (local)':<19}  {'Title':<20}  {'Done':<5}  {'Note'}", "-" * line_width]
     for r in rows:
-        due_local = dt.datetime.fromtimestamp(int(r["due_at"])).strftime("%d-%m-%Y %H:%M:%S")
-        title = (r["title"] or "Reminder")[:20]
-        status = " " + u'\u2705' if r["completed_at"] is not None else " " + u'\u274C'
-        print(f"{r['id']:>4}  {due_local:<19}  {title:<20}  {status:<4}  {r['note']}")
+        rid, due_at, title, note, completed_at = r.id, r.due_at, r.title, r.note, r.completed_at
+        due_local = dt.datetime.fromtimestamp(int(due_at)).strftime("%d-%m-%Y %H:%M:%S")
+        status = " " + u'\u2705' if completed_at is not None else " " + u'\u274C'
+        # %-20.20s truncates and pads the title in one step.
+        lines.append("%4d  %-19s  %-20.20s  %-4s  %s" % (rid, due_local, title or "Reminder", status, note))
+    sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 
@@ -367,6 +469,68 @@ def cmd_del(args) -> int:
     return 1
 
 
+_URGENCY_LEVELS = {"low": 0, "normal": 1, "critical": 2}
+
+_dbus_conn = None
+_dbus_tried = False
+
+
+def _dbus_connection():
+    """
+    Session-bus connection shared by every notification in this process,
+    or None if jeepney isn't installed or the bus can't be reached.
+    """
+    global _dbus_conn, _dbus_tried
+    if not _dbus_tried:
+        _dbus_tried = True
+        try:
+            from jeepney.io.blocking import open_dbus_connection
+            _dbus_conn = open_dbus_connection(bus="SESSION")
+        except Exception:
+            _dbus_conn = None
+    return _dbus_conn
+
+
+def _notify_dbus(
+    conn,
+    title: str,
+    body: str,
+    *,
+    replace_key: str | None,
+    icon: str | None,
+    urgency: str,
+    expire_ms: int | None,
+) -> None:
+    """Same toast as the notify-send path, sent as a direct Notify() call."""
+    from jeepney import DBusAddress, new_method_call
+    from jeepney.wrappers import unwrap_msg
+
+    addr = DBusAddress(
+        "/org/freedesktop/Notifications",
+        bus_name="org.freedesktop.Notifications",
+        interface="org.freedesktop.Notifications",
+    )
+    hints = {
+        "urgency": ("y", _URGENCY_LEVELS.get(urgency, 1)),
+        "category": ("s", "reminder"),
+    }
+    if replace_key:
+        hints["x-canonical-private-synchronous"] = ("s", replace_key)
+    msg = new_method_call(
+        addr, "Notify", "susssasa{sv}i",
+        ("remnd", 0, icon or "", title, body, [], hints, -1 if expire_ms is None else expire_ms),
+    )
+    # Error replies come back as messages; unwrap_msg raises them.
+    unwrap_msg(conn.send_and_get_reply(msg, timeout=5))
+
+
+@functools.lru_cache(maxsize=1)
+def _notify_send_path() -> str | None:
+    # PATH doesn't change during a run; resolve it once per process.
+    import shutil
+    return shutil.which("notify-send")
+
+
 def _send_notification(
     title: str,
     body: str,
@@ -375,17 +539,35 @@ def _send_notification(
     icon: str | None = None,
     urgency: str = "normal",   # "low" | "normal" | "critical"
     expire_ms: int | None = None,
-) -> None:
+    wait: bool = True,
+) -> subprocess.Popen | None:
     """
     Pretty libnotify toast via notify-send with:
       - themed or file icon
       - urgency levels
       - multiline Pango markup body
       - per-ID replacement to collapse duplicates
+    Goes straight over D-Bus (one connection per process) when jeepney is
+    available, otherwise spawns notify-send. With wait=False the notify-send
+    child is returned un-reaped so callers can fan out and wait once.
     """
-    if shutil.which("notify-send") is None:
+    global _dbus_conn
+    conn = _dbus_connection()
+    if conn is not None:
+        from jeepney import DBusErrorResponse
+        try:
+            _notify_dbus(conn, title, body, replace_key=replace_key, icon=icon, urgency=urgency, expire_ms=expire_ms)
+            return None
+        except (DBusErrorResponse, OSError):  # TimeoutError is an OSError
+            # Don't retry D-Bus for the rest of the run: each attempt may wait
+            # out the reply timeout, and a timed-out toast may already be shown.
+            _dbus_conn = None
+
+    import subprocess
+
+    if _notify_send_path() is None:
         print(f"[NOTIFY:{urgency}] {title} — {body}")
-        return
+        return None
 
     cmd = ["notify-send", "--app-name=remnd", f"--urgency={urgency}"]
 
@@ -402,100 +584,122 @@ def _send_notification(
 
     # Title should be plain; body may use small Pango markup.
     cmd += [title, body]
-    subprocess.run(cmd, check=False)
+    proc = subprocess.Popen(cmd)
+    if wait:
+        proc.wait()
+        return None
+    return proc
 
 
 
-def cmd_notify_due() -> int:
-    rows = due_unnotified()
-    now = dt.datetime.now().timestamp()
+def _toasts_unavailable() -> bool:
+    """
+    True when there is no way to show a toast and the console fallback would
+    only land in the journal (e.g. run from the systemd timer without
+    notify-send or a reachable bus).
+    """
+    return _notify_send_path() is None and not sys.stdout.isatty() and _dbus_connection() is None
 
-    for r in rows:
-        due_ts = int(r["due_at"])
-        overdue_s = int(now - due_ts)
-        due_local = dt.datetime.fromtimestamp(due_ts).strftime("%a %d %b • %H:%M")
 
-        title = f"{r['title'] or 'Reminder'}"
-        note = (r["note"] or "").strip()
+# C-locale names, matching what strftime's %a/%b produce (Python never calls setlocale).
+_WDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
 
-        body_lines = [f"{due_local}"]
-        if note:
-            body_lines.append(note)
-        body_lines.append(f"<span size='small' alpha='70%'>ID #{r['id']}</span>")
-        body = "\n".join(body_lines)
 
-        urgency = "normal" if overdue_s < 48 * 3600 else "critical"
+def _toast_time(ts: int) -> str:
+    """Local time as 'Mon 01 Jan • 09:00', without building a datetime."""
+    lt = time.localtime(ts)
+    return f"{_WDAYS[lt.tm_wday]} {lt.tm_mday:02d} {_MONTHS[lt.tm_mon - 1]} • {lt.tm_hour:02d}:{lt.tm_min:02d}"
 
-        _send_notification(
-            title,
-            body,
-            icon="appointment-soon",   # or your PNG path
-            replace_key=f"remnd-{r['id']}",
-            urgency=urgency,
-        )
-        mark_notified(int(r["id"]))
-    return 0
 
+def _overdue_urgency(overdue_s: int) -> str:
+    return "normal" if overdue_s < 48 * 3600 else "critical"
 
-def cmd_notify_catchup() -> int:
-    rows = due_active()
+
+def _notify_rows(
+    rows,
+    *,
+    urgency_policy,
+    icon: str = "appointment-soon",   # or your PNG path
+    expire_ms: int | None = None,
+    replace: bool = True,
+    mark: bool = True,
+) -> int:
+    """
+    Toast each due reminder row. `urgency_policy` maps seconds overdue to an
+    urgency; `replace` collapses repeats of the same reminder ID; `mark`
+    records the rows as notified afterwards. Unmarked toasts are fanned out
+    concurrently since nothing depends on each one finishing.
+    """
+    if not rows:
+        return 0
+    if _toasts_unavailable():
+        if mark:
+            # Still record them so they aren't reprocessed every run.
+            mark_notified_many(int(r.id) for r in rows)
+        return 0
+
+    now = time.time()
+    notified = []
+    procs = []
 
     for r in rows:
-        due_local = dt.datetime.fromtimestamp(int(r["due_at"])).strftime("%a %d %b • %H:%M")
-        title = f"{r['title'] or 'Reminder'}"
-        note = (r["note"] or "").strip()
+        rid, due_ts, title, note = int(r.id), int(r.due_at), r.title, r.note
+        due_local = _toast_time(due_ts)
+
+        title = f"{title or 'Reminder'}"
+        note = (note or "").strip()
 
         body_lines = [f"{due_local}"]
         if note:
             body_lines.append(note)
-        body_lines.append(f"<span size='small' alpha='70%'>ID #{r['id']}</span>")
+        body_lines.append(f"<span size='small' alpha='70%'>ID #{rid}</span>")
         body = "\n".join(body_lines)
 
-        # Fresh toast at login; keep it gentle and short-lived
-        _send_notification(
+        proc = _send_notification(
             title,
             body,
-            icon="appointment-soon",
-            urgency="low",
-            expire_ms=8000,
+            replace_key=f"remnd-{rid}" if replace else None,
+            icon=icon,
+            urgency=urgency_policy(int(now - due_ts)),
+            expire_ms=expire_ms,
+            wait=mark,
         )
+        if mark:
+            notified.append(rid)
+        elif proc is not None:
+            procs.append(proc)
+
+    for proc in procs:
+        proc.wait()
+    if mark:
+        mark_notified_many(notified)
     return 0
 
 
-def cmd_notify_renotify() -> int:
-    rows = due_renotify()
-    now = dt.datetime.now().timestamp()
-
-    for r in rows:
-        due_ts = int(r["due_at"])
-        overdue_s = int(now - due_ts)
-        due_local = dt.datetime.fromtimestamp(due_ts).strftime("%a %d %b • %H:%M")
+def cmd_notify_due() -> int:
+    return _notify_rows(due_unnotified(), urgency_policy=_overdue_urgency)
 
-        title = f"{r['title'] or 'Reminder'}"
-        note = (r["note"] or "").strip()
 
-        body_lines = [f"{due_local}"]
-        if note:
-            body_lines.append(note)
-        body_lines.append(f"<span size='small' alpha='70%'>ID #{r['id']}</span>")
-        body = "\n".join(body_lines)
+def cmd_notify_catchup() -> int:
+    # Fresh toast at login; keep it gentle and short-lived
+    return _notify_rows(
+        due_active(),
+        urgency_policy=lambda overdue_s: "low",
+        expire_ms=8000,
+        replace=False,
+        mark=False,
+    )
 
-        urgency = "normal" if overdue_s < 48 * 3600 else "critical"
 
-        _send_notification(
-            title,
-            body,
-            replace_key=f"remnd-{r['id']}",
-            icon="appointment-soon",   # or your PNG path
-            urgency=urgency,
-            expire_ms=15000,
-        )
-        mark_notified(int(r["id"]))
-    return 0
+def cmd_notify_renotify() -> int:
+    return _notify_rows(due_renotify(), urgency_policy=_overdue_urgency, expire_ms=15000)
 
 
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = build_parser(argv[0] if argv else None)
     args = parser.parse_args(argv)
 
     if args.cmd == "in" or args.cmd == "at":
@@ -1,18 +1,46 @@
 from __future__ import annotations
+import atexit
+import contextlib
+import functools
 import os
 import sqlite3
+import threading
 import time
 from pathlib import Path
 import datetime as _dt
 import calendar as _cal
+from collections import namedtuple
+from typing import Iterable
 
 
-APP_DIR = Path(os.getenv("XDG_STATE_HOME", Path.home() / ".local" / "state")) / "remnd"
-DB_PATH = APP_DIR / "remnd.sqlite3"
+@functools.lru_cache(maxsize=1)
+def _app_dir() -> Path:
+    state_home = os.getenv("XDG_STATE_HOME")
+    if state_home is None:
+        state_home = Path.home() / ".local" / "state"
+    return Path(state_home) / "remnd"
 
 
-SCHEMA = """
-CREATE TABLE IF NOT EXISTS reminders (
+@functools.lru_cache(maxsize=1)
+def _db_path() -> Path:
+    return _app_dir() / "remnd.sqlite3"
+
+
+def __getattr__(name: str):
+    # APP_DIR / DB_PATH stay importable but are only resolved on first use.
+    if name == "APP_DIR":
+        return _app_dir()
+    if name == "DB_PATH":
+        return _db_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# STRICT tables (SQLite 3.37+) store and compare the timestamp columns as true
+# integers; older libraries can't even parse the keyword, so they keep the
+# plain table.
+_STRICT = " STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+
+_TABLE_DEF = """(
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     title TEXT NOT NULL,
     note TEXT,
@@ -24,26 +52,218 @@ CREATE TABLE IF NOT EXISTS reminders (
     -- Repeat fields (NULL = not repeating)
     repeat_every INTEGER,       -- positive integer
     repeat_unit TEXT            -- one of: seconds, minutes, hours, days, weeks, months
-);
-CREATE INDEX IF NOT EXISTS idx_due_at ON reminders(due_at);
+)"""
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS reminders {_TABLE_DEF}{_STRICT};
+-- Superseded by the partial indexes below.
+DROP INDEX IF EXISTS idx_due_at;
+-- Active reminders in due order; notified_at lets the due_* filters run on the index.
+CREATE INDEX IF NOT EXISTS idx_active_due_id ON reminders(due_at, id, notified_at) WHERE completed_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_done_due ON reminders(due_at, id) WHERE completed_at IS NOT NULL;
+"""
+# Stored in PRAGMA user_version once SCHEMA has been applied. Bump it whenever
+# SCHEMA changes so existing databases pick the change up on their next run.
+SCHEMA_VERSION = 2
+
+_INITIALIZED = False
+
+# One reminders row. Readers select these columns explicitly (not *), so the
+# tuple layout doesn't depend on the table's physical column order.
+Reminder = namedtuple(
+    "Reminder",
+    "id title note due_at created_at notified_at completed_at repeat_every repeat_unit",
+)
+_COLUMNS = ", ".join(Reminder._fields)
+
+# Copies an existing non-STRICT reminders table into a STRICT one, keeping the
+# AUTOINCREMENT high-water mark so ids of deleted reminders aren't reused.
+# SCHEMA then recreates the indexes, which are dropped along with the old table.
+_STRICT_REBUILD = f"""
+CREATE TABLE reminders_new {_TABLE_DEF} STRICT;
+INSERT INTO reminders_new ({_COLUMNS}) SELECT {_COLUMNS} FROM reminders;
+DELETE FROM sqlite_sequence WHERE name = 'reminders_new';
+INSERT INTO sqlite_sequence(name, seq) SELECT 'reminders_new', seq FROM sqlite_sequence WHERE name = 'reminders';
+DROP TABLE reminders;
+ALTER TABLE reminders_new RENAME TO reminders;
 """
 
 
+# Hot statements, kept as constants so every call hands sqlite3 the same text
+# (and hits its prepared-statement cache).
+SQL_INSERT = (
+    "INSERT INTO reminders(title, note, due_at, created_at, repeat_every, repeat_unit) "
+    "VALUES(?,?,?,?,?,?)"
+)
+SQL_INSERT_RETURNING = SQL_INSERT + " RETURNING id"
+# RETURNING needs SQLite 3.35+; older system libraries fall back to lastrowid.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+SQL_LIST_ACTIVE = (
+    f"SELECT {_COLUMNS} FROM reminders "
+    "WHERE completed_at IS NULL "
+    "ORDER BY due_at ASC, id ASC"
+)
+SQL_LIST_DONE = (
+    f"SELECT {_COLUMNS} FROM reminders "
+    "WHERE completed_at IS NOT NULL "
+    "ORDER BY due_at ASC, id ASC"
+)
+SQL_LIST_COMPACT = (
+    "SELECT id, title, due_at, notified_at FROM reminders "
+    "WHERE completed_at IS NULL "
+    "ORDER BY due_at ASC, id ASC"
+)
+SQL_GET = f"SELECT {_COLUMNS} FROM reminders WHERE id=?"
+SQL_GET_ACTIVE = f"SELECT {_COLUMNS} FROM reminders WHERE id=? AND completed_at IS NULL"
+SQL_DELETE = "DELETE FROM reminders WHERE id=?"
+SQL_ROLL_FORWARD = "UPDATE reminders SET due_at=?, notified_at=NULL, completed_at=NULL WHERE id=?"
+SQL_MARK_COMPLETE = "UPDATE reminders SET completed_at=? WHERE id=? AND completed_at IS NULL"
+SQL_DUE_UNNOTIFIED = (
+    f"SELECT {_COLUMNS} FROM reminders "
+    "WHERE completed_at IS NULL "
+    "  AND due_at <= ? "
+    "  AND (notified_at IS NULL OR notified_at = 0) "
+    "ORDER BY due_at ASC, id ASC "
+    "LIMIT ?"
+)
+SQL_DUE_RENOTIFY = (
+    f"SELECT {_COLUMNS} FROM reminders "
+    "WHERE completed_at IS NULL "
+    "  AND due_at <= ? "
+    "  AND notified_at IS NOT NULL "
+    "  AND notified_at > 0 "
+    "  AND notified_at <= ? "
+    "ORDER BY due_at ASC, id ASC "
+    "LIMIT ?"
+)
+SQL_DUE_ACTIVE = (
+    f"SELECT {_COLUMNS} FROM reminders "
+    "WHERE completed_at IS NULL "
+    "  AND due_at <= ? "
+    "ORDER BY due_at ASC, id ASC "
+    "LIMIT ?"
+)
+
+
+_DIRS_READY = False
+
+
 def _ensure_dirs() -> None:
-    APP_DIR.mkdir(parents=True, exist_ok=True)
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    _app_dir().mkdir(parents=True, exist_ok=True)
+    _DIRS_READY = True
+
+
+def _initialize(conn: sqlite3.Connection) -> None:
+    """
+    Apply connection settings and bring the schema up to SCHEMA_VERSION. The
+    database-level part (WAL mode, DDL) only runs once per process and only
+    writes when needed.
+    """
+    global _INITIALIZED
+    # Per-connection settings, always applied.
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA mmap_size=268435456;")   # 256 MiB cap; only what exists is mapped
+    conn.execute("PRAGMA cache_size=-65536;")     # 64 MiB page cache
+    conn.execute("PRAGMA busy_timeout=5000;")     # wait up to 5s on a locked database
+    if _INITIALIZED:
+        return
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        conn.execute("PRAGMA journal_mode=WAL;")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        script = SCHEMA
+        if _STRICT:
+            table = conn.execute("PRAGMA table_list('reminders')").fetchone()
+            if table is not None and not table[5]:  # (schema, name, type, ncol, wr, strict)
+                script = _STRICT_REBUILD + script
+        try:
+            conn.executescript(f"BEGIN IMMEDIATE; {script} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+    _INITIALIZED = True
 
 
 def connect() -> sqlite3.Connection:
     _ensure_dirs()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    with conn:
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA synchronous=NORMAL;")
-        conn.executescript(SCHEMA)
+    conn = sqlite3.connect(_db_path(), isolation_level=None, cached_statements=256)
+    _initialize(conn)
+    return conn
+
+
+@contextlib.contextmanager
+def _write_txn(conn: sqlite3.Connection):
+    """
+    Explicit write transaction for autocommit connections. BEGIN IMMEDIATE
+    takes the write lock up front rather than upgrading from a read lock
+    mid-transaction, which is where concurrent writers hit SQLITE_BUSY.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        # SQLite may already have rolled back (e.g. SQLITE_FULL, IOERR).
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _now() -> int:
+    """Current epoch seconds, without the float round-trip of int(time.time())."""
+    return time.time_ns() // 1_000_000_000
+
+
+# Connection, reader cursor and list cache are kept per thread: sqlite3
+# objects may only be used from the thread that created them.
+_LOCAL = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """This thread's connection, opened (and schema-initialised) on first use."""
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is None:
+        conn = _LOCAL.conn = connect()
+        # Other threads' connections are closed when their thread-local
+        # storage is released; close() from atexit would be a cross-thread call.
+        if threading.current_thread() is threading.main_thread():
+            atexit.register(conn.close)
     return conn
 
 
+# _LOCAL.list_cache holds list_reminders() results keyed by include_done,
+# each stored with the (_CACHE_VERSION, data_version) stamp it was read under.
+# _CACHE_VERSION counts our own writes; PRAGMA data_version changes when
+# another connection (another thread, or e.g. the notify timer) commits.
+_CACHE_VERSION = 0
+
+
+def _invalidate_cache() -> None:
+    global _CACHE_VERSION
+    _CACHE_VERSION += 1
+
+
+def _reminder_row(cursor: sqlite3.Cursor, row: tuple) -> Reminder:
+    return Reminder(*row)
+
+
+def _reminders() -> sqlite3.Cursor:
+    """
+    Long-lived cursor on this thread's connection that returns rows selected with
+    _COLUMNS as Reminder tuples. Always drain it with fetchall(): a statement
+    left mid-result would keep an old read snapshot open.
+    """
+    cur = getattr(_LOCAL, "cur", None)
+    if cur is None:
+        cur = _LOCAL.cur = _get_conn().cursor()
+        cur.row_factory = _reminder_row
+    return cur
+
+
 def add_reminder(
     *,
     title: str,
@@ -52,40 +272,77 @@ def add_reminder(
     repeat_every: int | None = None,
     repeat_unit: str | None = None
 ) -> int:
-    now = int(time.time())
-    with connect() as conn:
-        cur = conn.execute(
-            "INSERT INTO reminders(title, note, due_at, created_at, repeat_every, repeat_unit) "
-            "VALUES(?,?,?,?,?,?)",
-            (title, note, due_at, now, repeat_every, repeat_unit),
-        )
-        return int(cur.lastrowid)
+    now = _now()
+    _invalidate_cache()
+    conn = _get_conn()
+    params = (title, note, due_at, now, repeat_every, repeat_unit)
+    with _write_txn(conn):
+        if _HAS_RETURNING:
+            return conn.execute(SQL_INSERT_RETURNING, params).fetchone()[0]
+        return int(conn.execute(SQL_INSERT, params).lastrowid)
+
+
+def add_reminder_many(items: Iterable[tuple[str, str | None, int]]) -> int:
+    """
+    Insert (title, note, due_at) reminders in a single transaction.
+    Returns the number of rows inserted.
+    """
+    now = _now()
+    rows = [(title, note, due_at, now, None, None) for title, note, due_at in items]
+    if not rows:
+        return 0
+    _invalidate_cache()
+    conn = _get_conn()
+    with _write_txn(conn):
+        cur = conn.executemany(SQL_INSERT, rows)
+    return cur.rowcount
 
 
 def list_reminders(*, include_done: bool = False):
-    with connect() as conn:
-        if include_done:
-            return list(conn.execute(
-                "SELECT * FROM reminders ORDER BY "
-                "CASE WHEN completed_at IS NULL THEN 0 ELSE 1 END, "
-                "due_at ASC, id ASC"
-            ))
-        return list(conn.execute(
-            "SELECT * FROM reminders "
-            "WHERE completed_at IS NULL "
-            "ORDER BY due_at ASC, id ASC"
-        ))
+    conn = _get_conn()
+    stamp = (_CACHE_VERSION, conn.execute("PRAGMA data_version").fetchone()[0])
+    cache = getattr(_LOCAL, "list_cache", None)
+    if cache is None:
+        cache = _LOCAL.list_cache = {}
+    cached = cache.get(include_done)
+    if cached is not None and cached[0] == stamp:
+        return list(cached[1])
+
+    if include_done:
+        # Active first, then completed: two partial-index scans instead of
+        # sorting the whole table on a CASE expression. One read transaction
+        # so both see the same snapshot.
+        conn.execute("BEGIN")
+        try:
+            rows = _reminders().execute(SQL_LIST_ACTIVE).fetchall()
+            rows += _reminders().execute(SQL_LIST_DONE).fetchall()
+        finally:
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+    else:
+        rows = _reminders().execute(SQL_LIST_ACTIVE).fetchall()
+    cache[include_done] = (stamp, rows)
+    return list(rows)
+
+
+def list_reminders_compact() -> list[tuple[int, str, int, int | None]]:
+    """
+    Active reminders as plain (id, title, due_at, notified_at) tuples, in due
+    order. For callers that only render the list and don't need every column.
+    """
+    return _get_conn().execute(SQL_LIST_COMPACT).fetchall()
 
 
 def get_reminder(reminder_id: int):
-    with connect() as conn:
-        cur = conn.execute("SELECT * FROM reminders WHERE id=?", (reminder_id,))
-        return cur.fetchone()
+    rows = _reminders().execute(SQL_GET, (reminder_id,)).fetchall()
+    return rows[0] if rows else None
 
 
 def delete_reminder(reminder_id: int) -> bool:
-    with connect() as conn:
-        cur = conn.execute("DELETE FROM reminders WHERE id=?", (reminder_id,))
+    _invalidate_cache()
+    conn = _get_conn()
+    with _write_txn(conn):
+        cur = conn.execute(SQL_DELETE, (reminder_id,))
         return cur.rowcount > 0
 
 
@@ -95,84 +352,71 @@ def mark_complete(reminder_id: int) -> bool:
     For non-repeating: set completed_at.
     Returns True if something changed.
     """
-    now = int(time.time())
-    with connect() as conn:
-        row = conn.execute("SELECT * FROM reminders WHERE id=? AND completed_at IS NULL", (reminder_id,)).fetchone()
-        if not row:
+    now = _now()
+    _invalidate_cache()
+    conn = _get_conn()
+    with _write_txn(conn):
+        rows = _reminders().execute(SQL_GET_ACTIVE, (reminder_id,)).fetchall()
+        if not rows:
             return False
 
-        rep_every = row["repeat_every"]
-        rep_unit = row["repeat_unit"]
+        row = rows[0]
+        rep_every = row.repeat_every
+        rep_unit = row.repeat_unit
         if rep_every and rep_unit:
-            next_due = _advance_due(int(row["due_at"]), rep_every, rep_unit)
-            cur = conn.execute(
-                "UPDATE reminders SET due_at=?, notified_at=NULL, completed_at=NULL WHERE id=?",
-                (next_due, reminder_id),
-            )
+            next_due = _advance_due(int(row.due_at), rep_every, rep_unit)
+            cur = conn.execute(SQL_ROLL_FORWARD, (next_due, reminder_id))
             return cur.rowcount > 0
         else:
-            cur = conn.execute(
-                "UPDATE reminders SET completed_at=? WHERE id=? AND completed_at IS NULL",
-                (now, reminder_id),
-            )
+            cur = conn.execute(SQL_MARK_COMPLETE, (now, reminder_id))
             return cur.rowcount > 0
 
 
-def due_unnotified(limit: int = 100):
+def due_unnotified(limit: int = 100, *, now: int | None = None):
     """Active reminders that are due and have not been notified yet."""
-    now = int(time.time())
-    with connect() as conn:
-        return list(conn.execute(
-            "SELECT * FROM reminders "
-            "WHERE completed_at IS NULL "
-            "  AND due_at <= ? "
-            "  AND (notified_at IS NULL OR notified_at = 0) "
-            "ORDER BY due_at ASC, id ASC "
-            "LIMIT ?",
-            (now, limit),
-        ))
-
-
-def due_renotify(interval_seconds: int = 24 * 60 * 60, limit: int = 500):
+    if now is None:
+        now = _now()
+    return _reminders().execute(SQL_DUE_UNNOTIFIED, (now, limit)).fetchall()
+
+
+def due_renotify(interval_seconds: int = 24 * 60 * 60, limit: int = 500, *, now: int | None = None):
     """Active reminders that are due and were notified before the given interval."""
-    now = int(time.time())
+    if now is None:
+        now = _now()
     threshold = now - interval_seconds
-    with connect() as conn:
-        return list(conn.execute(
-            "SELECT * FROM reminders "
-            "WHERE completed_at IS NULL "
-            "  AND due_at <= ? "
-            "  AND notified_at IS NOT NULL "
-            "  AND notified_at > 0 "
-            "  AND notified_at <= ? "
-            "ORDER BY due_at ASC, id ASC "
-            "LIMIT ?",
-            (now, threshold, limit),
-        ))
+    return _reminders().execute(SQL_DUE_RENOTIFY, (now, threshold, limit)).fetchall()
 
 
 def mark_notified(reminder_id: int) -> bool:
-    now = int(time.time())
-    with connect() as conn:
-        cur = conn.execute(
-            "UPDATE reminders SET notified_at = ? WHERE id = ?",
-            (now, reminder_id),
-        )
-        return cur.rowcount > 0
+    return mark_notified_many((reminder_id,)) > 0
+
+
+def mark_notified_many(reminder_ids: Iterable[int]) -> int:
+    """Set notified_at on all given reminders in a single transaction. Returns rows updated."""
+    ids = [int(i) for i in reminder_ids]
+    if not ids:
+        return 0
+    now = _now()
+    updated = 0
+    _invalidate_cache()
+    conn = _get_conn()
+    with _write_txn(conn):
+        # Stay well under SQLite's bound-parameter limit (999 on older builds).
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cur = conn.execute(
+                f"UPDATE reminders SET notified_at = ? WHERE id IN ({','.join('?' * len(chunk))})",
+                (now, *chunk),
+            )
+            updated += cur.rowcount
+    return updated
 
 
-def due_active(limit: int = 500):
+def due_active(limit: int = 500, *, now: int | None = None):
     """All active (not completed) reminders that are already due, regardless of notified_at."""
-    now = int(time.time())
-    with connect() as conn:
-        return list(conn.execute(
-            "SELECT * FROM reminders "
-            "WHERE completed_at IS NULL "
-            "  AND due_at <= ? "
-            "ORDER BY due_at ASC, id ASC "
-            "LIMIT ?",
-            (now, limit),
-        ))
+    if now is None:
+        now = _now()
+    return _reminders().execute(SQL_DUE_ACTIVE, (now, limit)).fetchall()
 
 
 def _advance_due(due_at_epoch: int, every: int, unit: str) -> int: